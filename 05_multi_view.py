@@ -0,0 +1,236 @@
+import sys
+import time
+import numpy as np
+from PySide6.QtWidgets import QApplication
+from PySide6.QtOpenGLWidgets import QOpenGLWidget
+from PySide6.QtGui import QSurfaceFormat
+from PySide6.QtOpenGL import QOpenGLShaderProgram, QOpenGLShader
+from PySide6.QtCore import Qt, QTimer
+from OpenGL import GL
+from objLoader import OBJLoader
+import mvpMath
+
+# Show several lenses side by side in one widget: one context, one teapot VBO, one shader program.
+# Run with --naive to instead open one window per lens, each parsing teapot.obj and uploading its own copy, for comparison.
+#   H / L : rotate model      T : toggle turntable animation      P : print memory and frame time report
+
+# Say we have 3 primes of 18mm, 28mm, and 58mm on a Super 35 camera.
+LENSES = [18, 28, 58]
+REPORT_EVERY = 120 # frames
+
+# Resource counters shared by every widget in this process, so the naive setup reports its real totals.
+resources = {"obj_parses": 0, "programs": 0, "buffer_bytes": 0, "framebuffer_bytes": 0}
+widgets = []
+
+class MultiViewWidget(QOpenGLWidget):
+    # Constructor
+    def __init__(self, lenses=LENSES, parent=None):
+        super(MultiViewWidget, self).__init__(parent)
+        self.lenses = list(lenses)
+        self.fovs = mvpMath.fov_from_focal_length(self.lenses)
+
+        # MVP Matrices set to be same type OpenGL accepts, 32-bit floats, with one projection per view.
+        self.model_matrix = np.identity(4, dtype=np.float32)
+        self.view_matrix = np.identity(4, dtype=np.float32)
+        self.projection_matrices = np.tile(np.identity(4, dtype=np.float32), (len(self.lenses), 1, 1))
+
+        self.vertex_count = 0
+        self.model_yaw = 90.0 # degrees
+        self.framebuffer_bytes = 0
+        self.frame_times = []
+        self.views_drawn = 0
+        widgets.append(self)
+
+    # Setup OpenGL data and state.
+    def initializeGL(self):
+        # Setup shader program(s) used.  Shared by every view.
+        self.shader_program = QOpenGLShaderProgram()
+        self.shader_program.addShaderFromSourceFile(QOpenGLShader.Vertex, "vsobj.glsl")
+        self.shader_program.addShaderFromSourceFile(QOpenGLShader.Fragment, "fsBP.glsl")
+        self.shader_program.link()
+        resources["programs"] += 1
+
+        # Setup geometry by loading teapot.obj using objLoader.py, once for all views.
+        obj_loader = OBJLoader()
+        obj_loader.load("teapot.obj")
+        resources["obj_parses"] += 1
+        modelData = obj_loader.get_interleaved_data()
+        self.vertex_count = len(modelData) // 6
+
+        # Bounding sphere in model space, used to cull whole views that cannot see the teapot.
+        self.bound_center, self.bound_radius = mvpMath.bounding_sphere(modelData.reshape(-1, 6)[:, :3])
+
+        # Create and bind Vertex Array Object (VAO).
+        self.vao = GL.glGenVertexArrays(1)
+        GL.glBindVertexArray(self.vao)
+
+        # Generate, bind, and pass data for Vertex Buffer Object (VBO).
+        self.vertex_buffer = GL.glGenBuffers(1)
+        GL.glBindBuffer(GL.GL_ARRAY_BUFFER, self.vertex_buffer)
+        GL.glBufferData(GL.GL_ARRAY_BUFFER, modelData.nbytes, modelData.tobytes(), GL.GL_STATIC_DRAW)
+        resources["buffer_bytes"] += modelData.nbytes
+
+        # Attribute layout lives in the VAO, so set it once here instead of every view of every frame.
+        self.shader_program.bind()
+        position_attr = self.shader_program.attributeLocation("position")
+        normal_attr = self.shader_program.attributeLocation("normal")
+        self.shader_program.enableAttributeArray(position_attr)
+        self.shader_program.enableAttributeArray(normal_attr)
+        self.shader_program.setAttributeBuffer(position_attr, GL.GL_FLOAT, 0, 3, 6 * 4)
+        self.shader_program.setAttributeBuffer(normal_attr, GL.GL_FLOAT, 3 * 4, 3, 6 * 4)
+
+        # Locate references to shader uniforms once, too.
+        prog = self.shader_program.programId()
+        self.mloc = GL.glGetUniformLocation(prog, "model")
+        self.vloc = GL.glGetUniformLocation(prog, "view")
+        self.ploc = GL.glGetUniformLocation(prog, "projection")
+        self.lploc = GL.glGetUniformLocation(prog, "light_position")
+        self.lcloc = GL.glGetUniformLocation(prog, "light_color")
+        self.ocloc = GL.glGetUniformLocation(prog, "object_color")
+        self.sloc = GL.glGetUniformLocation(prog, "shine")
+        self.shader_program.release()
+
+        # Model and View Matrices.
+        self.model_matrix = mvpMath.model_matrix(self.model_yaw)
+        self.view_matrix = mvpMath.view_matrix([0.0, 1.0, 4], 0.0)
+
+        # Projection Matrices
+        self.setupProjectionMatrices(self.width(), self.height())
+
+        GL.glEnable(GL.GL_DEPTH_TEST)
+        GL.glClearColor(0.2, 0.2, 0.2, 1.0)
+
+
+    # Utility functions
+
+    # Each view gets an equal-width column, so all projections share one aspect ratio and are built in one batch.
+    def setupProjectionMatrices(self, width, height):
+        aspect_ratio = (width / len(self.lenses)) / height
+        self.projection_matrices = mvpMath.projection_matrices(self.fovs, np.full(len(self.lenses), aspect_ratio))
+
+    # Rough size of the default MSAA framebuffer: RGBA8 color plus 24/8 depth-stencil per sample.
+    def updateFramebufferBytes(self, width, height):
+        samples = max(self.format().samples(), 1)
+        resources["framebuffer_bytes"] -= self.framebuffer_bytes
+        self.framebuffer_bytes = width * height * samples * (4 + 4)
+        resources["framebuffer_bytes"] += self.framebuffer_bytes
+
+    def updateModelMatrix(self):
+        self.model_matrix = mvpMath.model_matrix(self.model_yaw)
+
+
+    # Refresh GL context on window re-size.
+    def resizeGL(self, width, height):
+        self.setupProjectionMatrices(width, height)
+        ratio = self.devicePixelRatio()
+        self.updateFramebufferBytes(int(width * ratio), int(height * ratio))
+
+    # Draw calls.
+    def paintGL(self):
+        start = time.perf_counter()
+        GL.glClear(GL.GL_COLOR_BUFFER_BIT | GL.GL_DEPTH_BUFFER_BIT)
+
+        # One batched pass for every view: compose all MVPs, extract their frustum planes, and cull the teapot against each.
+        mvps = mvpMath.compose_mvp(self.projection_matrices, self.view_matrix, self.model_matrix)
+        planes = mvpMath.frustum_planes(mvps)
+        visible = mvpMath.spheres_in_frustum(planes, self.bound_center, self.bound_radius)[:, 0]
+
+        self.shader_program.bind()
+        GL.glBindVertexArray(self.vao)
+
+        # Uniforms common to all views are passed once per frame (transposed from Numpy's row-major).
+        GL.glUniformMatrix4fv(self.mloc, 1, GL.GL_FALSE, self.model_matrix.T.astype(np.float32))
+        GL.glUniformMatrix4fv(self.vloc, 1, GL.GL_FALSE, self.view_matrix.T.astype(np.float32))
+        GL.glUniform3f(self.lploc, 10.0, 10.0, 3.0)
+        GL.glUniform3f(self.lcloc, 1.0, 1.0, 1.0)
+        GL.glUniform3f(self.ocloc, 0.965, 0.404, 0.2)
+        GL.glUniform1f(self.sloc, 10.0)
+
+        # Then only the viewport and projection change between views.
+        ratio = self.devicePixelRatio()
+        width, height = int(self.width() * ratio), int(self.height() * ratio)
+        view_width = width // len(self.lenses)
+        self.views_drawn = 0
+        for i in np.flatnonzero(visible):
+            GL.glViewport(int(i) * view_width, 0, view_width, height)
+            GL.glUniformMatrix4fv(self.ploc, 1, GL.GL_FALSE, self.projection_matrices[i].T.astype(np.float32))
+            GL.glDrawArrays(GL.GL_TRIANGLES, 0, self.vertex_count)
+            self.views_drawn += 1
+
+        self.shader_program.release()
+
+        # Wait for the GPU so the measured time covers the whole frame, not just command submission.
+        GL.glFinish()
+        self.frame_times.append(time.perf_counter() - start)
+        if len(self.frame_times) >= REPORT_EVERY and self is widgets[0]:
+            printReport()
+
+    # Update MVP parameters as desired and trigger new draw call.
+    def keyPressEvent(self, event):
+        if event.key() == Qt.Key_H:
+            self.model_yaw -= 20
+            self.updateModelMatrix()
+            self.update()
+        elif event.key() == Qt.Key_L:
+            self.model_yaw += 20
+            self.updateModelMatrix()
+            self.update()
+        elif event.key() == Qt.Key_T:
+            toggleTurntable()
+        elif event.key() == Qt.Key_P:
+            printReport()
+
+
+# Memory and frame time for everything this process has created.  In naive mode a frame is one paint of every window.
+def printReport():
+    mode = "naive, %d windows" % len(widgets) if len(widgets) > 1 else "shared, 1 widget"
+    views = sum(len(w.lenses) for w in widgets)
+    frame_ms = sum(1000.0 * np.mean(w.frame_times) for w in widgets if w.frame_times)
+    print("[%s] views: %d  obj parses: %d  programs: %d  vertex buffers: %.2f MB  framebuffers (est.): %.2f MB  frame: %.3f ms" % (
+        mode, views, resources["obj_parses"], resources["programs"],
+        resources["buffer_bytes"] / 2**20, resources["framebuffer_bytes"] / 2**20, frame_ms))
+    for w in widgets:
+        w.frame_times = []
+
+def tick():
+    for w in widgets:
+        w.model_yaw += 1.0
+        w.updateModelMatrix()
+        w.update()
+
+def toggleTurntable():
+    if turntable.isActive():
+        turntable.stop()
+    else:
+        turntable.start()
+
+
+#################################################################
+# Main
+#################################################################
+
+# Set the surface format before creating the application instance
+format = QSurfaceFormat()
+format.setVersion(4, 1)
+format.setProfile(QSurfaceFormat.CoreProfile)
+format.setSamples(4)
+QSurfaceFormat.setDefaultFormat(format)
+
+# Create and show the application and widget(s)
+app = QApplication([])
+turntable = QTimer()
+turntable.setInterval(0)
+turntable.timeout.connect(tick)
+
+if "--naive" in sys.argv:
+    for lens in LENSES:
+        w = MultiViewWidget([lens])
+        w.setWindowTitle("%d mm (naive)" % lens)
+        w.resize(400, 400)
+        w.show()
+else:
+    w = MultiViewWidget(LENSES)
+    w.setWindowTitle(" | ".join("%d mm" % lens for lens in LENSES))
+    w.resize(400 * len(LENSES), 400)
+    w.show()
+app.exec()
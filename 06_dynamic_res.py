@@ -0,0 +1,237 @@
+import sys
+import time
+import numpy as np
+from PySide6.QtWidgets import QApplication
+from PySide6.QtOpenGLWidgets import QOpenGLWidget
+from PySide6.QtGui import QSurfaceFormat
+from PySide6.QtOpenGL import QOpenGLShaderProgram, QOpenGLShader
+from PySide6.QtCore import Qt, QTimer
+from OpenGL import GL
+from objLoader import OBJLoader
+from renderScale import RenderScaleController
+import mvpMath
+
+# Render the teapot into an offscreen 4x MSAA framebuffer whose size follows a frame time budget,
+# then upscale it to the widget with a linear-filtered blit.
+#   H / L : rotate model      Up / Down : draw the teapot more / fewer times per frame to add load
+#   D : toggle dynamic scaling (off renders at native resolution)      [ / ] : lower / raise target frame time
+
+TARGET_MS = 16.7
+SAMPLES = 4
+
+class GLWidget(QOpenGLWidget):
+    # Constructor
+    def __init__(self, parent=None):
+        super(GLWidget, self).__init__(parent)
+        # MVP Matrices set to be same type OpenGL accepts, 32-bit floats.
+        self.model_matrix = np.identity(4, dtype=np.float32)
+        self.view_matrix = np.identity(4, dtype=np.float32)
+        self.projection_matrix = np.identity(4, dtype=np.float32)
+        self.fov = mvpMath.fov_from_focal_length(18)
+
+        self.vertex_count = 0
+        self.model_yaw = 90.0 # degrees
+        self.draw_repeats = 1
+
+        # Offscreen render targets are (re)created lazily when the scaled size changes.
+        self.controller = RenderScaleController(target_ms=TARGET_MS)
+        self.dynamic = True
+        self.fbo_size = (0, 0)
+        self.msaa_fbo = self.resolve_fbo = None
+        self.renderbuffers = []
+
+    # Setup OpenGL data and state.
+    def initializeGL(self):
+        # Setup shader program(s) used.
+        self.shader_program = QOpenGLShaderProgram()
+        self.shader_program.addShaderFromSourceFile(QOpenGLShader.Vertex, "vsobj.glsl")
+        self.shader_program.addShaderFromSourceFile(QOpenGLShader.Fragment, "fsBP.glsl")
+        self.shader_program.link()
+
+        # Setup geometry by loading teapot.obj using objLoader.py.
+        obj_loader = OBJLoader()
+        obj_loader.load("teapot.obj")
+        modelData = obj_loader.get_interleaved_data()
+        self.vertex_count = len(modelData) // 6
+
+        # Create and bind Vertex Array Object (VAO).
+        self.vao = GL.glGenVertexArrays(1)
+        GL.glBindVertexArray(self.vao)
+
+        # Generate, bind, and pass data for Vertex Buffer Object (VBO).
+        self.vertex_buffer = GL.glGenBuffers(1)
+        GL.glBindBuffer(GL.GL_ARRAY_BUFFER, self.vertex_buffer)
+        GL.glBufferData(GL.GL_ARRAY_BUFFER, modelData.nbytes, modelData.tobytes(), GL.GL_STATIC_DRAW)
+
+        # Model, View, and Projection Matrices.
+        self.model_matrix = mvpMath.model_matrix(self.model_yaw)
+        self.view_matrix = mvpMath.view_matrix([0.0, 1.0, 4], 0.0)
+        self.projection_matrix = mvpMath.projection_matrix(self.fov, self.width() / self.height())
+
+        GL.glEnable(GL.GL_DEPTH_TEST)
+        GL.glClearColor(0.2, 0.2, 0.2, 1.0)
+
+
+    # Utility functions
+
+    # Scaled size of the offscreen target in device pixels, never smaller than 1x1.
+    def scaledSize(self):
+        ratio = self.devicePixelRatio()
+        scale = self.controller.scale if self.dynamic else 1.0
+        return max(int(self.width() * ratio * scale), 1), max(int(self.height() * ratio * scale), 1)
+
+    # A multisampled FBO to draw into, and a single-sample FBO to resolve into, since a multisampled
+    # framebuffer cannot be blitted with scaling.  Both use renderbuffers as nothing samples them as textures.
+    def setupFramebuffers(self, width, height):
+        self.deleteFramebuffers()
+        color_ms, depth_ms, color = GL.glGenRenderbuffers(3)
+        self.renderbuffers = [color_ms, depth_ms, color]
+
+        GL.glBindRenderbuffer(GL.GL_RENDERBUFFER, color_ms)
+        GL.glRenderbufferStorageMultisample(GL.GL_RENDERBUFFER, SAMPLES, GL.GL_RGBA8, width, height)
+        GL.glBindRenderbuffer(GL.GL_RENDERBUFFER, depth_ms)
+        GL.glRenderbufferStorageMultisample(GL.GL_RENDERBUFFER, SAMPLES, GL.GL_DEPTH24_STENCIL8, width, height)
+        GL.glBindRenderbuffer(GL.GL_RENDERBUFFER, color)
+        GL.glRenderbufferStorage(GL.GL_RENDERBUFFER, GL.GL_RGBA8, width, height)
+
+        self.msaa_fbo, self.resolve_fbo = GL.glGenFramebuffers(2)
+        GL.glBindFramebuffer(GL.GL_FRAMEBUFFER, self.msaa_fbo)
+        GL.glFramebufferRenderbuffer(GL.GL_FRAMEBUFFER, GL.GL_COLOR_ATTACHMENT0, GL.GL_RENDERBUFFER, color_ms)
+        GL.glFramebufferRenderbuffer(GL.GL_FRAMEBUFFER, GL.GL_DEPTH_STENCIL_ATTACHMENT, GL.GL_RENDERBUFFER, depth_ms)
+        GL.glBindFramebuffer(GL.GL_FRAMEBUFFER, self.resolve_fbo)
+        GL.glFramebufferRenderbuffer(GL.GL_FRAMEBUFFER, GL.GL_COLOR_ATTACHMENT0, GL.GL_RENDERBUFFER, color)
+        if GL.glCheckFramebufferStatus(GL.GL_FRAMEBUFFER) != GL.GL_FRAMEBUFFER_COMPLETE:
+            print("Offscreen framebuffer incomplete at %dx%d" % (width, height))
+        self.fbo_size = (width, height)
+
+    def deleteFramebuffers(self):
+        if self.msaa_fbo is not None:
+            GL.glDeleteFramebuffers(2, [self.msaa_fbo, self.resolve_fbo])
+            GL.glDeleteRenderbuffers(len(self.renderbuffers), self.renderbuffers)
+        self.msaa_fbo = self.resolve_fbo = None
+        self.renderbuffers = []
+
+    def updateModelMatrix(self):
+        self.model_matrix = mvpMath.model_matrix(self.model_yaw)
+
+    def updateTitle(self, frame_ms):
+        mode = "dynamic" if self.dynamic else "native"
+        self.setWindowTitle("%s  scale %.2f (%dx%d)  %.1f / %.1f ms  x%d teapots" % (
+            mode, self.controller.scale if self.dynamic else 1.0, self.fbo_size[0], self.fbo_size[1],
+            frame_ms, self.controller.target_ms, self.draw_repeats))
+
+
+    # Refresh projection on window re-size.  Render targets follow in paintGL via scaledSize().
+    def resizeGL(self, width, height):
+        self.projection_matrix = mvpMath.projection_matrix(self.fov, width / height)
+
+    # Draw calls.
+    def paintGL(self):
+        start = time.perf_counter()
+        width, height = self.scaledSize()
+        if (width, height) != self.fbo_size:
+            self.setupFramebuffers(width, height)
+
+        # Draw the scene into the offscreen target at the scaled resolution.
+        GL.glBindFramebuffer(GL.GL_FRAMEBUFFER, self.msaa_fbo)
+        GL.glViewport(0, 0, width, height)
+        GL.glEnable(GL.GL_DEPTH_TEST)
+        GL.glClear(GL.GL_COLOR_BUFFER_BIT | GL.GL_DEPTH_BUFFER_BIT)
+
+        self.shader_program.bind()
+        GL.glBindVertexArray(self.vao)
+
+        # Locate references to shader attributes and uniforms.
+        prog = self.shader_program.programId()
+        mloc = GL.glGetUniformLocation(prog, "model")
+        vloc = GL.glGetUniformLocation(prog, "view")
+        ploc = GL.glGetUniformLocation(prog, "projection")
+        lploc = GL.glGetUniformLocation(prog, "light_position")
+        lcloc = GL.glGetUniformLocation(prog, "light_color")
+        ocloc = GL.glGetUniformLocation(prog, "object_color")
+        sloc = GL.glGetUniformLocation(prog, "shine")
+
+        position_attr = self.shader_program.attributeLocation("position")
+        normal_attr = self.shader_program.attributeLocation("normal")
+        self.shader_program.enableAttributeArray(position_attr)
+        self.shader_program.enableAttributeArray(normal_attr)
+        self.shader_program.setAttributeBuffer(position_attr, GL.GL_FLOAT, 0, 3, 6 * 4)
+        self.shader_program.setAttributeBuffer(normal_attr, GL.GL_FLOAT, 3 * 4, 3, 6 * 4)
+
+        # Pass MVP to vertex shader (transposed from Numpy's row-major), then the rest of the uniforms.
+        GL.glUniformMatrix4fv(mloc, 1, GL.GL_FALSE, self.model_matrix.T.astype(np.float32))
+        GL.glUniformMatrix4fv(vloc, 1, GL.GL_FALSE, self.view_matrix.T.astype(np.float32))
+        GL.glUniformMatrix4fv(ploc, 1, GL.GL_FALSE, self.projection_matrix.T.astype(np.float32))
+        GL.glUniform3f(lploc, 10.0, 10.0, 3.0)
+        GL.glUniform3f(lcloc, 1.0, 1.0, 1.0)
+        GL.glUniform3f(ocloc, 0.965, 0.404, 0.2)
+        GL.glUniform1f(sloc, 10.0)
+
+        # Repeated draws stand in for a heavier scene.
+        for _ in range(self.draw_repeats):
+            GL.glDrawArrays(GL.GL_TRIANGLES, 0, self.vertex_count)
+
+        self.shader_program.release()
+
+        # Resolve MSAA at the scaled size, then stretch to the widget's own framebuffer with linear filtering.
+        GL.glBindFramebuffer(GL.GL_READ_FRAMEBUFFER, self.msaa_fbo)
+        GL.glBindFramebuffer(GL.GL_DRAW_FRAMEBUFFER, self.resolve_fbo)
+        GL.glBlitFramebuffer(0, 0, width, height, 0, 0, width, height, GL.GL_COLOR_BUFFER_BIT, GL.GL_NEAREST)
+
+        ratio = self.devicePixelRatio()
+        GL.glBindFramebuffer(GL.GL_READ_FRAMEBUFFER, self.resolve_fbo)
+        GL.glBindFramebuffer(GL.GL_DRAW_FRAMEBUFFER, self.defaultFramebufferObject())
+        GL.glBlitFramebuffer(0, 0, width, height, 0, 0, int(self.width() * ratio), int(self.height() * ratio),
+                             GL.GL_COLOR_BUFFER_BIT, GL.GL_LINEAR)
+        GL.glBindFramebuffer(GL.GL_FRAMEBUFFER, self.defaultFramebufferObject())
+
+        # Wait for the GPU so the controller sees the whole frame cost, then pick the scale for the next frame.
+        GL.glFinish()
+        frame_ms = 1000.0 * (time.perf_counter() - start)
+        if self.dynamic:
+            self.controller.update(frame_ms)
+        self.updateTitle(frame_ms)
+
+    # Update parameters as desired and trigger new draw call.
+    def keyPressEvent(self, event):
+        if event.key() == Qt.Key_H:
+            self.model_yaw -= 20
+            self.updateModelMatrix()
+        elif event.key() == Qt.Key_L:
+            self.model_yaw += 20
+            self.updateModelMatrix()
+        elif event.key() == Qt.Key_Up:
+            self.draw_repeats *= 2
+        elif event.key() == Qt.Key_Down:
+            self.draw_repeats = max(self.draw_repeats // 2, 1)
+        elif event.key() == Qt.Key_D:
+            self.dynamic = not self.dynamic
+            self.controller.reset()
+        elif event.key() == Qt.Key_BracketLeft:
+            self.controller.target_ms = max(self.controller.target_ms - 2.0, 1.0)
+        elif event.key() == Qt.Key_BracketRight:
+            self.controller.target_ms += 2.0
+        self.update()
+
+
+#################################################################
+# Main
+#################################################################
+
+# Set the surface format before creating the application instance.
+# MSAA now happens in the offscreen framebuffer; the widget's own framebuffer must be single-sample to be a scaled blit target.
+format = QSurfaceFormat()
+format.setVersion(4, 1)
+format.setProfile(QSurfaceFormat.CoreProfile)
+format.setSamples(0)
+QSurfaceFormat.setDefaultFormat(format)
+
+# Create and show the application and widget, repainting continuously so there is always a fresh frame time.
+app = QApplication([])
+w = GLWidget()
+w.resize(800, 600)
+w.show()
+timer = QTimer()
+timer.timeout.connect(w.update)
+timer.start(0)
+app.exec()
@@ -0,0 +1,55 @@
+import sys
+import time
+import argparse
+import numpy as np
+from objLoader import OBJLoader
+from softRaster import SoftwareRasterizer, save_ppm
+import mvpMath
+
+# Render the teapot from 04_mvp_obj_anim.py without OpenGL or Qt, e.g. on machines with no GPU.
+# Writes a reference image and reports triangles/s and frames/s at several resolutions.
+#   python 07_cpu_raster.py --out teapot_cpu.ppm --frames 5 --threads 8
+
+RESOLUTIONS = [(320, 240), (640, 480), (1280, 720), (1920, 1080)]
+
+parser = argparse.ArgumentParser()
+parser.add_argument("--out", default="teapot_cpu.ppm", help="reference image written at the first resolution")
+parser.add_argument("--frames", type=int, default=5, help="frames timed per resolution")
+parser.add_argument("--threads", type=int, default=None, help="worker threads (default: all cores)")
+parser.add_argument("--tile", type=int, default=32, help="tile size in pixels")
+parser.add_argument("--yaw", type=float, default=90.0, help="model yaw in degrees")
+args = parser.parse_args()
+
+# Setup geometry by loading teapot.obj using objLoader.py, exactly as uploaded to the VBO.
+obj_loader = OBJLoader()
+obj_loader.load("teapot.obj")
+modelData = obj_loader.get_interleaved_data()
+triangle_count = len(modelData) // 18
+
+# Same camera as the OpenGL example: 18mm lens on Super 35, camera at (0, 1, 4).
+model_matrix = mvpMath.model_matrix(args.yaw)
+view_matrix = mvpMath.view_matrix([0.0, 1.0, 4], 0.0)
+fov = mvpMath.fov_from_focal_length(18)
+
+rasterizer = SoftwareRasterizer(*RESOLUTIONS[0], tile_size=args.tile, threads=args.threads)
+rasterizer.set_mesh(modelData)
+
+print("%d triangles, %d threads, %dpx tiles" % (triangle_count, rasterizer.pool._max_workers, args.tile))
+for i, (width, height) in enumerate(RESOLUTIONS):
+    rasterizer.resize(width, height)
+    projection_matrix = mvpMath.projection_matrix(fov, width / height)
+
+    # One untimed frame to warm up, which also serves as the reference image.
+    image = rasterizer.render(model_matrix, view_matrix, projection_matrix)
+    if i == 0 and args.out:
+        save_ppm(args.out, image)
+
+    start = time.perf_counter()
+    for _ in range(args.frames):
+        rasterizer.render(model_matrix, view_matrix, projection_matrix)
+    elapsed = time.perf_counter() - start
+
+    print("%4dx%-4d  %7.2f frames/s  %10.0f triangles/s  (%d rasterized per frame)" % (
+        width, height, args.frames / elapsed, triangle_count * args.frames / elapsed, rasterizer.triangles_drawn))
+
+rasterizer.close()
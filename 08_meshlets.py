@@ -0,0 +1,157 @@
+import sys
+import numpy as np
+from PySide6.QtWidgets import QApplication
+from PySide6.QtOpenGLWidgets import QOpenGLWidget
+from PySide6.QtGui import QSurfaceFormat
+from PySide6.QtOpenGL import QOpenGLShaderProgram, QOpenGLShader
+from PySide6.QtCore import Qt
+from OpenGL import GL
+from objLoader import OBJLoader
+from meshlets import Meshlets
+import mvpMath
+
+# The animated teapot from 04_mvp_obj_anim.py, split into meshlets that are frustum and backface culled on the CPU
+# every frame.  Survivors are drawn with one glMultiDrawArrays call.  A turntable report is printed at startup.
+#   H / L : rotate model      C : toggle meshlet culling
+
+class GLWidget(QOpenGLWidget):
+    # Constructor
+    def __init__(self, meshlets, parent=None):
+        super(GLWidget, self).__init__(parent)
+        # MVP Matrices set to be same type OpenGL accepts, 32-bit floats.
+        self.model_matrix = np.identity(4, dtype=np.float32)
+        self.view_matrix = mvpMath.view_matrix([0.0, 1.0, 4], 0.0)
+        self.projection_matrix = np.identity(4, dtype=np.float32)
+        self.fov = mvpMath.fov_from_focal_length(18)
+
+        self.meshlets = meshlets
+        self.culling = True
+        self.model_yaw = 90.0 # degrees
+
+    # Setup OpenGL data and state.
+    def initializeGL(self):
+        # Setup shader program(s) used.
+        self.shader_program = QOpenGLShaderProgram()
+        self.shader_program.addShaderFromSourceFile(QOpenGLShader.Vertex, "vsobj.glsl")
+        self.shader_program.addShaderFromSourceFile(QOpenGLShader.Fragment, "fsBP.glsl")
+        self.shader_program.link()
+
+        # Geometry is the teapot reordered so each meshlet is a contiguous range of vertices.
+        modelData = self.meshlets.interleaved
+
+        # Create and bind Vertex Array Object (VAO).
+        self.vao = GL.glGenVertexArrays(1)
+        GL.glBindVertexArray(self.vao)
+
+        # Generate, bind, and pass data for Vertex Buffer Object (VBO).
+        self.vertex_buffer = GL.glGenBuffers(1)
+        GL.glBindBuffer(GL.GL_ARRAY_BUFFER, self.vertex_buffer)
+        GL.glBufferData(GL.GL_ARRAY_BUFFER, modelData.nbytes, modelData.tobytes(), GL.GL_STATIC_DRAW)
+
+        # Model and Projection Matrices.
+        self.updateModelMatrix()
+        self.projection_matrix = mvpMath.projection_matrix(self.fov, self.width() / self.height())
+
+        GL.glEnable(GL.GL_DEPTH_TEST)
+        GL.glClearColor(0.2, 0.2, 0.2, 1.0)
+
+
+    # Utility functions
+
+    def updateModelMatrix(self):
+        self.model_matrix = mvpMath.model_matrix(self.model_yaw)
+
+    # Refresh projection on window re-size.
+    def resizeGL(self, width, height):
+        self.projection_matrix = mvpMath.projection_matrix(self.fov, width / height)
+
+    # Draw calls.
+    def paintGL(self):
+        self.shader_program.bind()
+        GL.glClear(GL.GL_COLOR_BUFFER_BIT | GL.GL_DEPTH_BUFFER_BIT)
+
+        # Locate references to shader attributes and uniforms.
+        prog = self.shader_program.programId()
+        mloc = GL.glGetUniformLocation(prog, "model")
+        vloc = GL.glGetUniformLocation(prog, "view")
+        ploc = GL.glGetUniformLocation(prog, "projection")
+        lploc = GL.glGetUniformLocation(prog, "light_position")
+        lcloc = GL.glGetUniformLocation(prog, "light_color")
+        ocloc = GL.glGetUniformLocation(prog, "object_color")
+        sloc = GL.glGetUniformLocation(prog, "shine")
+
+        position_attr = self.shader_program.attributeLocation("position")
+        normal_attr = self.shader_program.attributeLocation("normal")
+        self.shader_program.enableAttributeArray(position_attr)
+        self.shader_program.enableAttributeArray(normal_attr)
+        self.shader_program.setAttributeBuffer(position_attr, GL.GL_FLOAT, 0, 3, 6 * 4)
+        self.shader_program.setAttributeBuffer(normal_attr, GL.GL_FLOAT, 3 * 4, 3, 6 * 4)
+
+        # Pass MVP to vertex shader (transposed from Numpy's row-major), then the rest of the uniforms.
+        GL.glUniformMatrix4fv(mloc, 1, GL.GL_FALSE, self.model_matrix.T.astype(np.float32))
+        GL.glUniformMatrix4fv(vloc, 1, GL.GL_FALSE, self.view_matrix.T.astype(np.float32))
+        GL.glUniformMatrix4fv(ploc, 1, GL.GL_FALSE, self.projection_matrix.T.astype(np.float32))
+        GL.glUniform3f(lploc, 10.0, 10.0, 3.0)
+        GL.glUniform3f(lcloc, 1.0, 1.0, 1.0)
+        GL.glUniform3f(ocloc, 0.965, 0.404, 0.2)
+        GL.glUniform1f(sloc, 10.0)
+
+        # Cull meshlets on the CPU, then submit every survivor in one call.
+        if self.culling:
+            visible = self.meshlets.cull(self.model_matrix, self.view_matrix, self.projection_matrix)
+        else:
+            visible = np.ones(len(self.meshlets.firsts), dtype=bool)
+        firsts, counts = self.meshlets.draw_ranges(visible)
+        if len(firsts) > 0:
+            GL.glMultiDrawArrays(GL.GL_TRIANGLES, firsts, counts, len(firsts))
+
+        self.shader_program.release()
+        self.setWindowTitle("yaw %.0f  meshlets %d / %d  triangles culled %.1f%%" % (
+            self.model_yaw, len(firsts), len(self.meshlets.firsts), 100.0 * self.meshlets.culled_fraction(visible)))
+
+    # Update MVP parameters as desired and trigger new draw call.
+    def keyPressEvent(self, event):
+        if event.key() == Qt.Key_H:
+            self.model_yaw -= 20
+            self.updateModelMatrix()
+            self.update()
+        elif event.key() == Qt.Key_L:
+            self.model_yaw += 20
+            self.updateModelMatrix()
+            self.update()
+        elif event.key() == Qt.Key_C:
+            self.culling = not self.culling
+            self.update()
+
+
+#################################################################
+# Main
+#################################################################
+
+# Build meshlets once, right after loading.
+obj_loader = OBJLoader()
+obj_loader.load("teapot.obj")
+meshlets = Meshlets(obj_loader)
+
+# Report culling over a full turn of the model with the default camera and a 4:3 window.
+print("%d meshlets (max %d vertices, %d triangles) from %d triangles" % (
+    len(meshlets.firsts), meshlets.max_vertices, meshlets.max_triangles, meshlets.triangle_count))
+report = meshlets.turntable_report(mvpMath.view_matrix([0.0, 1.0, 4], 0.0),
+                                   mvpMath.projection_matrix(mvpMath.fov_from_focal_length(18), 4 / 3))
+for yaw, drawn, culled in report:
+    print("model_yaw %5.1f  meshlets drawn %4d  triangles culled %5.1f%%" % (yaw, drawn, 100.0 * culled))
+print("mean triangles culled %.1f%%" % (100.0 * np.mean([culled for _, _, culled in report])))
+
+# Set the surface format before creating the application instance
+format = QSurfaceFormat()
+format.setVersion(4, 1)
+format.setProfile(QSurfaceFormat.CoreProfile)
+format.setSamples(4)
+QSurfaceFormat.setDefaultFormat(format)
+
+# Create and show the application and widget
+app = QApplication([])
+w = GLWidget(meshlets)
+w.resize(800, 600)
+w.show()
+app.exec()
@@ -0,0 +1,126 @@
+import numpy as np
+import mvpMath
+
+# Splits a loaded OBJ into small, spatially coherent clusters of triangles ("meshlets") so whole pieces of the
+# mesh can be skipped on the CPU before drawing.  Each meshlet keeps a bounding sphere for frustum culling and a
+# normal cone (axis plus spread) for backface culling.  Triangles are reordered so every meshlet is one contiguous
+# range of the vertex buffer, and the survivors of cull() can be drawn with a single glMultiDrawArrays.
+
+class Meshlets:
+    def __init__(self, obj_loader, max_vertices=64, max_triangles=124):
+        self.max_vertices = max_vertices
+        self.max_triangles = max_triangles
+
+        # Triangulated indices from OBJLoader (1-based), and the positions and normals they refer to.
+        vertex_indices = np.asarray(obj_loader.vertex_indices, dtype=np.int64) - 1
+        normal_indices = np.asarray(obj_loader.normal_indices, dtype=np.int64) - 1
+        vertices = np.asarray(obj_loader.vertices, dtype=np.float32).reshape(-1, 3)
+        normals = np.asarray(obj_loader.normals, dtype=np.float32).reshape(-1, 3)
+        positions = vertices[vertex_indices]                     # (triangles, 3 corners, xyz)
+        corner_normals = normals[normal_indices]
+
+        # Face normals from the winding, flipped where needed to agree with the OBJ's shading normals.
+        face_normals = np.cross(positions[:, 1] - positions[:, 0], positions[:, 2] - positions[:, 0])
+        flip = np.sum(face_normals * corner_normals.sum(axis=1), axis=1) < 0
+        face_normals[flip] *= -1
+        face_normals /= np.maximum(np.linalg.norm(face_normals, axis=1, keepdims=True), 1e-12)
+
+        order, ranges = self.partition(positions, face_normals, vertex_indices)
+        positions, corner_normals, face_normals = positions[order], corner_normals[order], face_normals[order]
+
+        # Same interleaved (position, normal) layout as OBJLoader.get_interleaved_data(), in meshlet order.
+        self.interleaved = np.concatenate([positions, corner_normals], axis=2).reshape(-1).astype(np.float32)
+        self.triangle_count = len(positions)
+        self.firsts = np.array([3 * start for start, end in ranges], dtype=np.int32)
+        self.counts = np.array([3 * (end - start) for start, end in ranges], dtype=np.int32)
+
+        self.compute_bounds(positions, face_normals, ranges)
+
+    # Triangles are first grouped by the axis their face normal points along most (+x, -x, +y, ...), so each meshlet's
+    # normals stay within a tight cone, then ordered along a Morton (Z-order) curve of their centroids so nearby
+    # triangles end up together.  A meshlet is closed as soon as adding the next triangle would exceed either limit.
+    def partition(self, positions, face_normals, vertex_indices):
+        dominant = np.argmax(np.abs(face_normals), axis=1)
+        direction = 2 * dominant + (face_normals[np.arange(len(face_normals)), dominant] < 0)
+
+        centroids = positions.mean(axis=1)
+        lo, hi = centroids.min(axis=0), centroids.max(axis=0)
+        cells = ((centroids - lo) / np.maximum(hi - lo, 1e-12) * 1023).astype(np.uint64)
+        order = np.lexsort((morton_code(cells), direction))
+
+        ranges = []
+        start = 0
+        meshlet_vertices = set()
+        for i, tri in enumerate(order):
+            tri_vertices = set(vertex_indices[tri].tolist())
+            if (i - start >= self.max_triangles or direction[tri] != direction[order[start]]
+                    or len(meshlet_vertices | tri_vertices) > self.max_vertices):
+                ranges.append((start, i))
+                start = i
+                meshlet_vertices = set()
+            meshlet_vertices |= tri_vertices
+        if start < len(order):
+            ranges.append((start, len(order)))
+        return order, ranges
+
+    def compute_bounds(self, positions, face_normals, ranges):
+        count = len(ranges)
+        self.centers = np.zeros((count, 3), dtype=np.float32)
+        self.radii = np.zeros(count, dtype=np.float32)
+        self.cone_axes = np.zeros((count, 3), dtype=np.float32)
+        self.cone_cutoffs = np.ones(count, dtype=np.float32)
+        for i, (start, end) in enumerate(ranges):
+            self.centers[i], self.radii[i] = mvpMath.bounding_sphere(positions[start:end])
+
+            # The cone axis is the average facing; the cutoff is the sine of the widest angle from it to any face.
+            # A spread of 90 degrees or more can always be seen from somewhere, so the cutoff stays at 1 (never culled).
+            axis = face_normals[start:end].sum(axis=0)
+            length = np.linalg.norm(axis)
+            if length < 1e-12:
+                continue
+            axis /= length
+            min_dot = np.min(face_normals[start:end] @ axis)
+            self.cone_axes[i] = axis
+            if min_dot > 0.0:
+                self.cone_cutoffs[i] = np.sqrt(1.0 - min_dot * min_dot)
+
+    # Per-frame visibility for every meshlet in one vectorized pass.  Tests run in model space, assuming a rigid model matrix.
+    def cull(self, model_matrix, view_matrix, projection_matrix):
+        mvp = mvpMath.compose_mvp(projection_matrix, view_matrix, model_matrix)
+        in_frustum = mvpMath.spheres_in_frustum(mvpMath.frustum_planes(mvp), self.centers, self.radii)[0]
+
+        # Backface: every triangle faces away when the whole bounding sphere lies behind the normal cone as seen from the camera.
+        camera = np.linalg.inv(np.dot(view_matrix, model_matrix).astype(np.float64))[:3, 3]
+        to_center = self.centers - camera
+        distance = np.linalg.norm(to_center, axis=1)
+        back_facing = np.sum(to_center * self.cone_axes, axis=1) >= self.cone_cutoffs * distance + self.radii
+
+        return in_frustum & ~back_facing
+
+    # First vertex and vertex count of each visible meshlet, ready for glMultiDrawArrays.
+    def draw_ranges(self, visible):
+        return self.firsts[visible], self.counts[visible]
+
+    def culled_fraction(self, visible):
+        return 1.0 - self.counts[visible].sum() / (3.0 * self.triangle_count)
+
+    # Fraction of triangles culled while the model turns through the given yaw angles (degrees).
+    def turntable_report(self, view_matrix, projection_matrix, yaws=range(0, 360, 15)):
+        rows = []
+        for yaw in yaws:
+            visible = self.cull(mvpMath.model_matrix(yaw), view_matrix, projection_matrix)
+            rows.append((yaw, int(visible.sum()), self.culled_fraction(visible)))
+        return rows
+
+
+# Interleave the bits of 10-bit x, y, z cell coordinates into one 30-bit Z-order key.
+def morton_code(cells):
+    def spread(v):
+        v = v & 0x3FF
+        v = (v | (v << 16)) & 0x030000FF
+        v = (v | (v << 8)) & 0x0300F00F
+        v = (v | (v << 4)) & 0x030C30C3
+        v = (v | (v << 2)) & 0x09249249
+        return v
+    cells = cells.astype(np.uint64)
+    return spread(cells[:, 0]) | (spread(cells[:, 1]) << np.uint64(1)) | (spread(cells[:, 2]) << np.uint64(2))
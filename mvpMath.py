@@ -0,0 +1,82 @@
+import numpy as np
+
+# The same model/view/projection math used by GLWidget in 02_mvp.py through 04_mvp_obj_anim.py,
+# pulled into one place so the later examples (and non-OpenGL code) can share it.
+# Matrices are composed visually in column order and stored row-major by Numpy, so transpose before glUniformMatrix4fv.
+
+# A Super 35mm cinema camera is usually about 24.89mm wide: https://en.wikipedia.org/wiki/Super_35
+SUPER35_SENSOR_WIDTH = 24.89
+
+# Calculate horizontal field of view in radians from lens focal length (mm), assuming Super 35 format.
+def fov_from_focal_length(lens_focal_length, sensor_width=SUPER35_SENSOR_WIDTH):
+    return 2 * np.arctan(sensor_width / (2 * np.asarray(lens_focal_length, dtype=np.float64)))
+
+def translate(identity, vec):
+    T = np.copy(identity)
+    T[:3, 3] = vec
+    return T
+
+def rotate_y_deg(identity, angle_deg):
+    angle_rad = np.radians(angle_deg)
+    cos_angle, sin_angle = np.cos(angle_rad), np.sin(angle_rad)
+    R = np.copy(identity)
+    R[0, 0], R[0, 2] = cos_angle, sin_angle
+    R[2, 0], R[2, 2] = -sin_angle, cos_angle
+    return R
+
+def model_matrix(model_yaw):
+    identity_mat4 = np.identity(4, dtype=np.float32)
+    R = rotate_y_deg(identity_mat4, model_yaw)
+    return np.dot(R, identity_mat4)
+
+def view_matrix(cam_pos, cam_yaw):
+    identity_mat4 = np.identity(4, dtype=np.float32)
+    T = translate(identity_mat4, -np.asarray(cam_pos, dtype=np.float32))
+    R = rotate_y_deg(identity_mat4, -cam_yaw)
+    return np.dot(R, T)
+
+def projection_matrix(fov, aspect_ratio, near=0.1, far=100.0):
+    return projection_matrices([fov], [aspect_ratio], near, far)[0]
+
+# Batched version of setupProjectionMatrix: one (N, 4, 4) stack for N (fov, aspect) pairs in a single pass.
+def projection_matrices(fovs, aspect_ratios, near=0.1, far=100.0):
+    fovs = np.asarray(fovs, dtype=np.float64)
+    aspect_ratios = np.asarray(aspect_ratios, dtype=np.float64)
+
+    # Scale dimensions based on fov, aspect, and frustum depth.
+    range = np.tan(fovs * 0.5) * near
+    P = np.zeros((len(fovs), 4, 4), dtype=np.float32)
+    P[:, 0, 0] = (2.0 * near) / (range * aspect_ratios + range * aspect_ratios)
+    P[:, 1, 1] = near / range
+    P[:, 2, 2] = -(far + near) / (far - near)
+    P[:, 2, 3] = -(2.0 * far * near) / (far - near)
+    P[:, 3, 2] = -1.0
+    return P
+
+# Compose projection * view * model for every view at once.  Each argument may be a single 4x4 or an (N, 4, 4) stack.
+def compose_mvp(projection, view, model):
+    return np.matmul(np.matmul(projection, view), model).astype(np.float32)
+
+# Extract the 6 clip planes (left, right, bottom, top, near, far) from (N, 4, 4) MVP matrices (Gribb/Hartmann).
+# Planes are (a, b, c, d) with a*x + b*y + c*z + d >= 0 inside, normalized so d is a true distance.
+def frustum_planes(mvps):
+    mvps = np.asarray(mvps, dtype=np.float64).reshape(-1, 4, 4)
+    r0, r1, r2, r3 = mvps[:, 0], mvps[:, 1], mvps[:, 2], mvps[:, 3]
+    planes = np.stack([r3 + r0, r3 - r0, r3 + r1, r3 - r1, r3 + r2, r3 - r2], axis=1)
+    planes /= np.linalg.norm(planes[..., :3], axis=-1, keepdims=True)
+    return planes
+
+# Test bounding spheres against frustum planes.  planes is (N, 6, 4), centers (M, 3); returns an (N, M) visibility mask.
+# Spheres are in the same space the MVP maps from (usually model space), so this assumes a rigid model matrix.
+def spheres_in_frustum(planes, centers, radii):
+    centers = np.asarray(centers, dtype=np.float64).reshape(-1, 3)
+    radii = np.asarray(radii, dtype=np.float64).reshape(-1)
+    distances = np.einsum('npk,mk->npm', planes[..., :3], centers) + planes[..., 3:4]
+    return np.all(distances >= -radii, axis=1)
+
+# Simple (not minimal) bounding sphere: center of the axis-aligned bounds, radius to the farthest point.
+def bounding_sphere(positions):
+    positions = np.asarray(positions, dtype=np.float32).reshape(-1, 3)
+    center = (positions.min(axis=0) + positions.max(axis=0)) * 0.5
+    radius = float(np.sqrt(((positions - center) ** 2).sum(axis=1).max()))
+    return center, radius
@@ -0,0 +1,66 @@
+import numpy as np
+
+# Chooses the offscreen render scale for 06_dynamic_res.py from measured frame times.
+# Pure Python/Numpy with no OpenGL or Qt, so the same sequence of frame times always yields the same scales
+# and the behaviour can be checked by feeding it synthetic traces, e.g.:
+#
+#   controller = RenderScaleController(target_ms=16.7)
+#   scales = controller.run_trace([30.0] * 50 + [8.0] * 50)
+#
+# Fill cost is roughly proportional to pixel count (scale squared), so the scale that would hit the target is
+# estimated as scale * sqrt(target / measured).  Moves are limited per step, quantized so the FBO is not
+# reallocated for tiny changes, and followed by a cooldown so new measurements reflect the new scale.
+
+class RenderScaleController:
+    def __init__(self, target_ms=16.7, min_scale=0.5, max_scale=1.0, max_step=0.1,
+                 granularity=0.05, history=8, headroom=0.8, cooldown=4):
+        self.target_ms = target_ms
+        self.min_scale = min_scale
+        self.max_scale = max_scale
+        self.max_step = max_step       # Largest change in scale allowed per adjustment.
+        self.granularity = granularity # Scales are snapped to multiples of this.
+        self.history = history         # Number of recent frames considered.
+        self.headroom = headroom       # Only scale up when frames are under headroom * target (hysteresis).
+        self.cooldown = cooldown       # Frames to skip after a change before measuring again.
+        self.reset()
+
+    def reset(self, scale=None):
+        self.scale = self.max_scale if scale is None else self.clamp(scale)
+        self.frame_times = []
+        self.frames_to_skip = 0
+
+    def clamp(self, scale):
+        return float(min(max(scale, self.min_scale), self.max_scale))
+
+    # Snap down, so being over budget always costs at least one step and scaling up stays conservative.
+    def quantize(self, scale):
+        return self.clamp(round(np.floor(scale / self.granularity + 1e-6) * self.granularity, 6))
+
+    # Record one frame time in milliseconds and return the scale to use for the next frame.
+    def update(self, frame_ms):
+        if self.frames_to_skip > 0:
+            self.frames_to_skip -= 1
+            return self.scale
+
+        self.frame_times.append(float(frame_ms))
+        if len(self.frame_times) < self.history:
+            return self.scale
+        self.frame_times = self.frame_times[-self.history:]
+
+        # The median ignores the odd hitch (GC pause, window event) that a mean would chase.
+        measured_ms = float(np.median(self.frame_times))
+        if self.target_ms * self.headroom <= measured_ms <= self.target_ms:
+            return self.scale
+
+        ideal = self.scale * np.sqrt(self.target_ms / max(measured_ms, 1e-6))
+        step = np.clip(ideal - self.scale, -self.max_step, self.max_step)
+        new_scale = self.quantize(self.scale + step)
+        if new_scale != self.scale:
+            self.scale = new_scale
+            self.frame_times = []
+            self.frames_to_skip = self.cooldown
+        return self.scale
+
+    # Feed a whole trace of frame times (ms) and return the scale chosen after each one.
+    def run_trace(self, frame_times):
+        return [self.update(frame_ms) for frame_ms in frame_times]
@@ -0,0 +1,199 @@
+import os
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+
+# A CPU-only stand-in for the OpenGL teapot pipeline: same MVP math (mvpMath.py), same Blinn-Phong model as fsBP.glsl.
+# Triangles are transformed in one batch, binned into square screen tiles, and each tile is rasterized on a
+# thread pool with vectorized edge functions and a depth buffer.  Tiles own disjoint pixels, so threads never
+# write to the same memory, and Numpy releases the GIL inside its array loops.
+
+class SoftwareRasterizer:
+    def __init__(self, width, height, tile_size=32, threads=None, batch_size=64):
+        self.width = width
+        self.height = height
+        self.tile_size = tile_size
+        self.batch_size = batch_size # Triangles tested against a tile's pixels at once; bounds temporary memory.
+        self.pool = ThreadPoolExecutor(max_workers=threads or os.cpu_count())
+        self.positions = np.zeros((0, 3), dtype=np.float64)
+        self.normals = np.zeros((0, 3), dtype=np.float64)
+        self.triangles_drawn = 0
+
+    # Takes the same interleaved (position, normal) data uploaded to the VBO in the OpenGL examples.
+    def set_mesh(self, interleaved_data):
+        data = np.asarray(interleaved_data, dtype=np.float64).reshape(-1, 6)
+        self.positions = data[:, :3]
+        self.normals = data[:, 3:]
+
+    def resize(self, width, height):
+        self.width, self.height = width, height
+
+    def close(self):
+        self.pool.shutdown()
+
+    # Render one frame and return it as an (height, width, 3) uint8 image, top row first.
+    def render(self, model, view, projection, light_position=(10.0, 10.0, 3.0), light_color=(1.0, 1.0, 1.0),
+               object_color=(0.965, 0.404, 0.2), shine=10.0, clear_color=(0.2, 0.2, 0.2)):
+        model, view, projection = (np.asarray(m, dtype=np.float64) for m in (model, view, projection))
+        self.setup_triangles(model, view, projection)
+        self.light_position_view = (view @ np.append(np.asarray(light_position, dtype=np.float64), 1.0))[:3]
+        self.light_color = np.asarray(light_color, dtype=np.float64)
+        self.object_color = np.asarray(object_color, dtype=np.float64)
+        self.shine = shine
+
+        # Rows are in OpenGL's bottom-up order until the final flip.
+        self.color = np.empty((self.height, self.width, 3), dtype=np.float64)
+        self.color[:] = clear_color
+        self.depth = np.ones((self.height, self.width), dtype=np.float64)
+
+        list(self.pool.map(lambda tile: self.raster_tile(*tile), self.bin_triangles()))
+
+        image = np.clip(self.color[::-1] * 255.0 + 0.5, 0, 255).astype(np.uint8)
+        return image
+
+    # Vertex stage for every vertex at once, mirroring vsobj.glsl, then per-triangle setup.
+    def setup_triangles(self, model, view, projection):
+        model_view = view @ model
+        positions = np.hstack([self.positions, np.ones((len(self.positions), 1))])
+        clip = positions @ (projection @ model_view).T
+        pos_cam = (positions @ model_view.T)[:, :3]
+        normal_cam = self.normals @ model_view[:3, :3].T
+        normal_cam /= np.maximum(np.linalg.norm(normal_cam, axis=1, keepdims=True), 1e-12)
+
+        clip = clip.reshape(-1, 3, 4)
+        w = clip[..., 3]
+
+        # No clipping: drop triangles crossing the near plane or entirely outside one side of the frustum.
+        keep = np.all(w > 1e-6, axis=1)
+        for axis in range(3):
+            keep &= ~np.all(clip[..., axis] < -w, axis=1)
+            keep &= ~np.all(clip[..., axis] > w, axis=1)
+
+        # Viewport transform to pixel coordinates (pixel centers at +0.5) and [0, 1] depth.
+        ndc = clip[..., :3] / w[..., None]
+        sx = (ndc[..., 0] * 0.5 + 0.5) * self.width
+        sy = (ndc[..., 1] * 0.5 + 0.5) * self.height
+        sz = ndc[..., 2] * 0.5 + 0.5
+
+        # Pixel bounds covered by each triangle's pixel centers, clamped to the screen.
+        x0 = np.clip(np.ceil(sx.min(axis=1) - 0.5), 0, self.width - 1).astype(np.int64)
+        x1 = np.clip(np.floor(sx.max(axis=1) - 0.5), -1, self.width - 1).astype(np.int64)
+        y0 = np.clip(np.ceil(sy.min(axis=1) - 0.5), 0, self.height - 1).astype(np.int64)
+        y1 = np.clip(np.floor(sy.max(axis=1) - 0.5), -1, self.height - 1).astype(np.int64)
+
+        # Edge functions as barycentric planes b_i(x, y) = A_i * x + B_i * y + C_i, pre-divided by the signed
+        # area so either winding gives b_i >= 0 inside.  Vertex i's weight comes from the opposite edge.
+        area = (sx[:, 1] - sx[:, 0]) * (sy[:, 2] - sy[:, 0]) - (sy[:, 1] - sy[:, 0]) * (sx[:, 2] - sx[:, 0])
+        keep &= (np.abs(area) > 1e-12) & (x0 <= x1) & (y0 <= y1)
+        safe_area = np.where(keep, area, 1.0)
+        A = np.empty((len(sx), 3))
+        B = np.empty((len(sx), 3))
+        C = np.empty((len(sx), 3))
+        for i in range(3):
+            a, b = (i + 1) % 3, (i + 2) % 3
+            A[:, i] = -(sy[:, b] - sy[:, a]) / safe_area
+            B[:, i] = (sx[:, b] - sx[:, a]) / safe_area
+            C[:, i] = (sx[:, a] * sy[:, b] - sx[:, b] * sy[:, a]) / safe_area
+
+        self.visible = np.flatnonzero(keep)
+        self.bounds = (x0, x1, y0, y1)
+        self.edges = (A, B, C)
+        self.tri_depth = sz
+        self.tri_inv_w = 1.0 / np.where(w > 0, w, 1.0)
+        self.tri_pos_cam = pos_cam.reshape(-1, 3, 3)
+        self.tri_normal_cam = normal_cam.reshape(-1, 3, 3)
+        self.triangles_drawn = len(self.visible)
+
+    # Assign every visible triangle to each tile its bounds overlap, in submission order, as (tile, triangle ids) pairs.
+    def bin_triangles(self):
+        ts = self.tile_size
+        tiles_x = (self.width + ts - 1) // ts
+        x0, x1, y0, y1 = (b[self.visible] // ts for b in self.bounds)
+        span_x = x1 - x0 + 1
+        counts = span_x * (y1 - y0 + 1)
+        if counts.sum() == 0:
+            return []
+
+        tri_ids = np.repeat(self.visible, counts)
+        within = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        span_x = np.repeat(span_x, counts)
+        tile_ids = (np.repeat(y0, counts) + within // span_x) * tiles_x + np.repeat(x0, counts) + within % span_x
+
+        order = np.argsort(tile_ids, kind='stable')
+        tile_ids, tri_ids = tile_ids[order], tri_ids[order]
+        tiles, starts = np.unique(tile_ids, return_index=True)
+        return [((int(tile) % tiles_x, int(tile) // tiles_x), ids) for tile, ids in zip(tiles, np.split(tri_ids, starts[1:]))]
+
+    def raster_tile(self, tile, tri_ids):
+        ts = self.tile_size
+        x0, y0 = tile[0] * ts, tile[1] * ts
+        x1, y1 = min(x0 + ts, self.width), min(y0 + ts, self.height)
+        py, px = np.mgrid[y0:y1, x0:x1]
+        px = px.ravel() + 0.5
+        py = py.ravel() + 0.5
+        pixels = np.arange(len(px))
+
+        depth = self.depth[y0:y1, x0:x1].ravel().copy()
+        best_tri = np.full(len(px), -1, dtype=np.int64)
+        best_bary = np.zeros((len(px), 3))
+        A, B, C = self.edges
+
+        # Per batch, find the nearest covering triangle for every pixel, then depth test it against the buffer.
+        for start in range(0, len(tri_ids), self.batch_size):
+            ids = tri_ids[start:start + self.batch_size]
+            bary = A[ids, :, None] * px + B[ids, :, None] * py + C[ids, :, None]
+            inside = np.all(bary >= 0.0, axis=1)
+            z = np.einsum('tip,ti->tp', bary, self.tri_depth[ids])
+            z = np.where(inside & (z >= 0.0), z, np.inf)
+
+            nearest = np.argmin(z, axis=0)
+            z = z[nearest, pixels]
+            closer = z < depth
+            if not closer.any():
+                continue
+            depth[closer] = z[closer]
+            best_tri[closer] = ids[nearest[closer]]
+            best_bary[closer] = bary[nearest[closer], :, pixels[closer]]
+
+        self.depth[y0:y1, x0:x1] = depth.reshape(y1 - y0, x1 - x0)
+        covered = best_tri >= 0
+        if not covered.any():
+            return
+
+        # Perspective-correct interpolation of the varyings, then the fragment shader.
+        tris = best_tri[covered]
+        weights = best_bary[covered] * self.tri_inv_w[tris]
+        weights /= weights.sum(axis=1, keepdims=True)
+        normal_cam = np.einsum('pi,pik->pk', weights, self.tri_normal_cam[tris])
+        pos_cam = np.einsum('pi,pik->pk', weights, self.tri_pos_cam[tris])
+
+        color = self.color[y0:y1, x0:x1].reshape(-1, 3)
+        color[covered] = shade_blinn_phong(normal_cam, pos_cam, self.light_position_view,
+                                           self.light_color, self.object_color, self.shine)
+        self.color[y0:y1, x0:x1] = color.reshape(y1 - y0, x1 - x0, 3)
+
+
+# fsBP.glsl for many fragments at once.  light_position_view is the light already transformed by the view matrix.
+def shade_blinn_phong(normal_cam, pos_cam, light_position_view, light_color, object_color, shine):
+    normal = normal_cam / np.maximum(np.linalg.norm(normal_cam, axis=1, keepdims=True), 1e-12)
+    light_direction = light_position_view - pos_cam
+    light_direction /= np.maximum(np.linalg.norm(light_direction, axis=1, keepdims=True), 1e-12)
+
+    ambient = 0.2 * object_color
+
+    diff = np.maximum(np.sum(normal * light_direction, axis=1, keepdims=True), 0.0)
+    diffuse = diff * object_color
+
+    spec_strength = 0.5
+    view_direction = -pos_cam / np.maximum(np.linalg.norm(pos_cam, axis=1, keepdims=True), 1e-12)
+    halfway_direction = light_direction + view_direction
+    halfway_direction /= np.maximum(np.linalg.norm(halfway_direction, axis=1, keepdims=True), 1e-12)
+    spec = np.maximum(np.sum(normal * halfway_direction, axis=1, keepdims=True), 0.0) ** shine
+    specular = spec * light_color * spec_strength
+
+    return ambient + diffuse + specular
+
+# Binary PPM needs nothing beyond Numpy, which suits headless machines.
+def save_ppm(filename, image):
+    with open(filename, 'wb') as file:
+        file.write(b"P6\n%d %d\n255\n" % (image.shape[1], image.shape[0]))
+        file.write(np.ascontiguousarray(image, dtype=np.uint8).tobytes())